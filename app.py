@@ -1,7 +1,7 @@
 # streamlit_app.py
 import os
 import sys
-import json
+import orjson
 import time
 from pathlib import Path
 from typing import Any
@@ -64,66 +64,65 @@ with st.expander("Example queries", expanded=False):
 # UI placeholders for live updates
 log_box = st.empty()
 extracted_box = st.empty()
-companies_placeholder = st.empty()
+companies_container = st.container()
 analysis_box = st.empty()
 download_placeholder = st.empty()
 
-def render_companies(companies_list):
-    """Render a list of company dicts into the companies_placeholder"""
-    with companies_placeholder.container():
-        st.header("Companies / Tools Found")
-        if not companies_list:
-            st.info("No companies found (yet). Results will appear here as the agent researches tools.")
-            return
-
-        for company in companies_list:
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            c1, c2 = st.columns([3, 1])
-            with c1:
-                st.subheader(company.get("name", "Unnamed"))
-                meta = []
-                if company.get("website"):
-                    meta.append(company.get("website"))
-                if company.get("pricing_model"):
-                    meta.append(str(company.get("pricing_model")))
-                if company.get("is_open_source") is True:
-                    meta.append("Open source")
-                elif company.get("is_open_source") is False:
-                    meta.append("Proprietary")
-
-                if meta:
-                    st.markdown(f"<div class='meta'>{' • '.join(meta)}</div>", unsafe_allow_html=True)
-
-                if company.get("description"):
-                    st.write(company.get("description"))
-
-                if company.get("tech_stack"):
-                    st.markdown("".join([f"<span class='chip'>{t}</span>" for t in company.get("tech_stack", [])[:12]]),
-                                unsafe_allow_html=True)
-
-            with c2:
-                api_av = company.get("api_available")
-                if api_av is True:
-                    st.markdown("**API:** ✅")
-                elif api_av is False:
-                    st.markdown("**API:** ❌")
-                else:
-                    st.markdown("**API:** Unknown")
-
-                if company.get("language_support"):
-                    st.markdown("**Languages:** " + ", ".join(company.get("language_support", [])[:6]))
-
-                if company.get("integration_capabilities"):
-                    st.markdown("**Integrations:** " + ", ".join(company.get("integration_capabilities", [])[:6]))
-
-                if company.get("website"):
-                    st.markdown(f"[Visit website]({company.get('website')})")
-
-            with st.expander("More details & raw JSON"):
-                st.markdown("**Full Company JSON (pydantic model)**")
-                st.code(json.dumps(company, indent=2, default=str), language="json")
-
-            st.markdown("</div>", unsafe_allow_html=True)
+@st.fragment
+def render_one_company(company):
+    """Render a single company dict as a card in the current container"""
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        st.subheader(company.get("name", "Unnamed"))
+        meta = []
+        if company.get("website"):
+            meta.append(company.get("website"))
+        if company.get("pricing_model"):
+            meta.append(str(company.get("pricing_model")))
+        if company.get("is_open_source") is True:
+            meta.append("Open source")
+        elif company.get("is_open_source") is False:
+            meta.append("Proprietary")
+
+        if meta:
+            st.markdown(f"<div class='meta'>{' • '.join(meta)}</div>", unsafe_allow_html=True)
+
+        if company.get("description"):
+            st.write(company.get("description"))
+
+        if company.get("tech_stack"):
+            st.markdown("".join([f"<span class='chip'>{t}</span>" for t in company.get("tech_stack", [])[:12]]),
+                        unsafe_allow_html=True)
+
+    with c2:
+        api_av = company.get("api_available")
+        if api_av is True:
+            st.markdown("**API:** ✅")
+        elif api_av is False:
+            st.markdown("**API:** ❌")
+        else:
+            st.markdown("**API:** Unknown")
+
+        if company.get("language_support"):
+            st.markdown("**Languages:** " + ", ".join(company.get("language_support", [])[:6]))
+
+        if company.get("integration_capabilities"):
+            st.markdown("**Integrations:** " + ", ".join(company.get("integration_capabilities", [])[:6]))
+
+        if company.get("website"):
+            st.markdown(f"[Visit website]({company.get('website')})")
+
+    with st.expander("More details & raw JSON"):
+        st.markdown("**Full Company JSON (pydantic model)**")
+        st.code(orjson.dumps(company, default=str, option=orjson.OPT_INDENT_2).decode(), language="json")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+@st.cache_resource
+def get_llm(model: str, temp: float) -> ChatAnthropic:
+    """One client per (model, temperature) for the whole server, so its HTTP pool survives reruns"""
+    return ChatAnthropic(model=model, temperature=temp)
 
 # Run workflow with streaming callback
 if run_button:
@@ -139,9 +138,11 @@ if run_button:
         st.exception(e)
         st.stop()
 
-    # instantiate
+    # instantiate once per session; a Workflow holds the current run's callback, so it isn't shared
     try:
-        workflow = Workflow()
+        if "workflow" not in st.session_state:
+            st.session_state["workflow"] = Workflow()
+        workflow = st.session_state["workflow"]
     except Exception as e:
         st.error("Failed to initialize Workflow (missing FIRECRAWL_API_KEY or LLM creds, or missing packages).")
         st.exception(e)
@@ -149,15 +150,17 @@ if run_button:
 
     # optionally override LLM
     try:
-        
         if llm_model:
-            workflow.llm = ChatAnthropic(model=llm_model, temperature=temperature)
+            workflow.llm = get_llm(llm_model, temperature)
     except Exception:
         # not fatal
         pass
 
-    # local state for progressive results
-    companies_seen = []
+    # cards are appended as companies arrive, never redrawn
+    with companies_container:
+        st.header("Companies / Tools Found")
+        companies_status = st.empty()
+    companies_status.info("No companies found (yet). Results will appear here as the agent researches tools.")
 
     # define progress callback used by workflow
     def on_progress(event: dict):
@@ -173,28 +176,22 @@ if run_button:
             tool = event.get("tool")
             log_box.info(f"🔎 Researching tool: {tool}")
         elif phase == "company_ready":
-            # append and re-render companies
+            # render only the new card
             comp = event.get("company", {})
-            companies_seen.append(comp)
-            render_companies(companies_seen)
+            companies_status.empty()
+            with companies_container:
+                render_one_company(comp)
         elif phase == "analysis_start":
             log_box.info("🧠 Generating recommendations...")
+            st.session_state["analysis_buffer"] = ""
             analysis_box.markdown("**Recommendations:** _Generating..._")
+        elif phase == "analysis_delta":
+            # placeholder updates don't rerun the script, so rendering per chunk stays cheap
+            st.session_state["analysis_buffer"] = st.session_state.get("analysis_buffer", "") + event.get("delta", "")
+            analysis_box.markdown(f"**Recommendations:**\n\n{st.session_state['analysis_buffer']}")
         elif phase == "analysis_done":
             analysis = event.get("analysis", "")
             analysis_box.markdown(f"**Recommendations:**\n\n{analysis}")
-        elif phase == "final":
-            # enable download of final state if available
-            try:
-                data = event.get("final_state")
-                download_placeholder.download_button(
-                    "Download final state (JSON)",
-                    data=json.dumps(data, indent=2, default=str),
-                    file_name="research_final_state.json",
-                    mime="application/json"
-                )
-            except Exception:
-                pass
         elif phase == "error":
             log_box.error(f"Error: {event.get('error')}")
 
@@ -210,10 +207,19 @@ if run_button:
         duration = time.time() - start_ts
 
     st.success(f"Research completed in {duration:.1f} seconds")
-    # final rendering if any remaining companies haven't been drawn (safety)
-    render_companies(companies_seen)
     if getattr(result, "analysis", None):
         analysis_box.markdown(f"**Recommendations:**\n\n{result.analysis}")
 
+    # serialized once, after the run, instead of inside the progress callback
+    try:
+        download_placeholder.download_button(
+            "Download final state (JSON)",
+            data=orjson.dumps(result.model_dump(mode="json"), option=orjson.OPT_INDENT_2),
+            file_name="research_final_state.json",
+            mime="application/json"
+        )
+    except Exception:
+        pass
+
     st.balloons()
     
@@ -0,0 +1,6 @@
+from .disk import cached
+from .fuzzy import FuzzyContentCache
+from .llm import LLMCache
+from .semantic import SemanticCache
+
+__all__ = ["FuzzyContentCache", "LLMCache", "SemanticCache", "cached"]
@@ -0,0 +1,36 @@
+import functools
+import hashlib
+import os
+from typing import Optional
+import diskcache
+
+
+def cached(ttl: int, directory: str, toggle_env: Optional[str] = None):
+    """
+    Memoize an async method on disk for `ttl` seconds, keyed by method name and
+    positional args. Results must be picklable; None and exceptions are not cached.
+    Setting the `toggle_env` variable to "off" forces a refresh: the cache isn't read, but
+    fresh results still replace the stored ones.
+    """
+    cache: Optional[diskcache.Cache] = None
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args):
+            nonlocal cache
+            if cache is None:
+                cache = diskcache.Cache(directory)
+
+            key = hashlib.sha256("|".join([func.__name__, *map(str, args)]).encode()).hexdigest()
+            refresh = bool(toggle_env) and os.getenv(toggle_env, "").lower() == "off"
+            value = None if refresh else cache.get(key)
+            if value is not None:
+                return value
+            value = await func(self, *args)
+            if value is not None:
+                cache.set(key, value, expire=ttl)
+            return value
+
+        return wrapper
+
+    return decorator
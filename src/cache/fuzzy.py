@@ -0,0 +1,130 @@
+import hashlib
+import re
+import threading
+import time
+from typing import List, Optional
+import diskcache
+import numpy as np
+from datasketch import MinHash
+
+# page noise that changes between otherwise identical scrapes
+_NOISE_PATTERNS = [
+    re.compile(r"<script\b.*?</script>", re.IGNORECASE | re.DOTALL),
+    re.compile(r"<style\b.*?</style>", re.IGNORECASE | re.DOTALL),
+    re.compile(r"<meta\b[^>]*>", re.IGNORECASE),
+    re.compile(r"<[^>]+>"),
+    re.compile(r"\b\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?\b"),
+    re.compile(r"\b\d{1,2}/\d{1,2}/\d{2,4}\b"),
+    re.compile(
+        r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.? \d{1,2}(?:st|nd|rd|th)?,? \d{4}\b",
+        re.IGNORECASE,
+    ),
+    re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm)?\b", re.IGNORECASE),
+]
+
+
+class FuzzyContentCache:
+    """On-disk cache keyed by near-duplicate page content.
+
+    Each entry stores a MinHash of the page's word shingles; a lookup returns the
+    first unexpired entry in the same namespace whose estimated Jaccard similarity
+    reaches `threshold`. Entries expire after `ttl` seconds, are kept in LRU order
+    and are capped at `max_entries`.
+    """
+
+    def __init__(
+        self,
+        directory: str = "./.analysis_cache",
+        threshold: float = 0.95,
+        num_perm: int = 64,
+        shingle_size: int = 5,
+        max_entries: int = 5000,
+        ttl: int = 7 * 24 * 60 * 60,
+    ):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._index = diskcache.Index(directory)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        for pattern in _NOISE_PATTERNS:
+            text = pattern.sub(" ", text)
+        return " ".join(text.lower().split())
+
+    def _shingles(self, text: str) -> List[bytes]:
+        words = text.split()
+        if len(words) <= self.shingle_size:
+            return [" ".join(words).encode()]
+        return [
+            " ".join(words[i:i + self.shingle_size]).encode()
+            for i in range(len(words) - self.shingle_size + 1)
+        ]
+
+    def _minhash(self, text: str) -> np.ndarray:
+        minhash = MinHash(num_perm=self.num_perm)
+        minhash.update_batch(self._shingles(text))
+        return minhash.hashvalues
+
+    def get(self, namespace: str, text: str) -> Optional[str]:
+        """Analysis cached for a near-identical page, or None. A cache error counts as a miss."""
+        try:
+            return self._get(namespace, self._minhash(self.normalize(text)))
+        except Exception as e:
+            print(f"Analysis cache lookup failed, treating as a miss: {e}")
+            return None
+
+    def _get(self, namespace: str, hashvalues: np.ndarray) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            expired = []
+            hit = None
+            # other processes share the index, so a key may vanish between listing and reading it
+            for key in list(self._index.keys()):
+                entry = self._index.get(key)
+                if entry is None:
+                    continue
+                # entries written without an expiry predate the TTL and are dropped too
+                if len(entry) != 4 or entry[3] <= now:
+                    expired.append(key)
+                    continue
+                entry_namespace, entry_hashvalues, value, _ = entry
+                if entry_namespace != namespace or len(entry_hashvalues) != len(hashvalues):
+                    continue
+                if np.count_nonzero(entry_hashvalues == hashvalues) / len(hashvalues) >= self.threshold:
+                    hit = key, value
+                    break
+            for key in expired:
+                self._index.pop(key, None)
+            if hit is None:
+                return None
+            key, value = hit
+            # re-insert to mark as most recently used
+            entry = self._index.pop(key, None)
+            if entry is not None:
+                self._index[key] = entry
+            return value
+
+    def set(self, namespace: str, text: str, value: str):
+        """Store an analysis; a cache error is logged and the entry skipped."""
+        try:
+            self._set(namespace, text, value)
+        except Exception as e:
+            print(f"Analysis cache store failed: {e}")
+
+    def _set(self, namespace: str, text: str, value: str):
+        normalized = self.normalize(text)
+        key = hashlib.sha256(f"{namespace}|{normalized}".encode()).hexdigest()
+        entry = (namespace, self._minhash(normalized), value, time.time() + self.ttl)
+        with self._lock:
+            self._index.pop(key, None)
+            self._index[key] = entry
+            while len(self._index) > self.max_entries:
+                try:
+                    self._index.popitem(last=False)
+                except KeyError:
+                    # emptied concurrently
+                    break
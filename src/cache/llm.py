@@ -0,0 +1,51 @@
+import hashlib
+import json
+from typing import Any, Callable, List, Optional, Type
+import diskcache
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+
+class LLMCache:
+    """Exact-match, on-disk cache for near-deterministic LLM calls.
+
+    Responses are stored as strings (message text, or model JSON for structured
+    output) under a SHA-256 of the model, temperature, schema and messages.
+    """
+
+    def __init__(self, directory: str = "./.llm_cache", max_temperature: float = 0.3):
+        self.max_temperature = max_temperature
+        self._cache = diskcache.Cache(directory)
+
+    def cache_key(
+        self,
+        model: Optional[str],
+        messages: List[BaseMessage],
+        temperature: Optional[float],
+        schema: Optional[Type[BaseModel]] = None,
+    ) -> Optional[str]:
+        """Key for a call, or None when sampling is too random for replay to be sound."""
+        if temperature is not None and temperature > self.max_temperature:
+            return None
+        payload: Any = {
+            "model": model,
+            "temperature": temperature,
+            "schema": schema.model_json_schema() if schema is not None else None,
+            "messages": [{"type": m.type, "content": m.content} for m in messages],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        return self._cache.get(key) if key is not None else None
+
+    def set(self, key: Optional[str], value: str):
+        if key is not None:
+            self._cache.set(key, value)
+
+    def get_or_compute(self, key: Optional[str], compute: Callable[[], str]) -> str:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        self.set(key, value)
+        return value
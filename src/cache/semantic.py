@@ -0,0 +1,93 @@
+import threading
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+
+class SemanticCache:
+    """In-memory cache of LLM responses, looked up by prompt embedding similarity.
+
+    Entries are namespaced by an exact key (model, temperature and system prompt)
+    and matched on the cosine similarity of the user prompt. MiniLM truncates its
+    input at 256 word pieces, so embedding a shared system prompt too would swamp
+    the part that varies.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_entries: int = 1000,
+    ):
+        self.threshold = threshold
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._model = None
+        self._load_failed = False
+        self._lock = threading.Lock()
+        # namespace -> (unit-norm embeddings, cached values), kept in insertion order
+        self._embeddings: Dict[str, np.ndarray] = {}
+        self._values: Dict[str, List[str]] = {}
+
+    def _embed(self, text: str) -> np.ndarray:
+        with self._lock:
+            if self._model is None:
+                # don't retry a failed import or Hub download on every call
+                if self._load_failed:
+                    raise RuntimeError(f"embedding model {self.model_name} is unavailable")
+                try:
+                    # imported lazily: loading torch is slow and only needed on first lookup
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name)
+                except Exception:
+                    self._load_failed = True
+                    raise
+        return np.asarray(self._model.encode(text, normalize_embeddings=True), dtype=np.float32)
+
+    def _lookup(self, embedding: np.ndarray, namespace: str) -> Optional[str]:
+        with self._lock:
+            embeddings = self._embeddings.get(namespace)
+            if embeddings is None:
+                return None
+            scores = embeddings @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._values[namespace][best]
+            return None
+
+    def _store(self, embedding: np.ndarray, value: str, namespace: str):
+        with self._lock:
+            embeddings = self._embeddings.get(namespace)
+            values = self._values.setdefault(namespace, [])
+            if embeddings is None:
+                embeddings = embedding[np.newaxis, :]
+            else:
+                embeddings = np.vstack([embeddings, embedding])
+            values.append(value)
+            if len(values) > self.max_entries:
+                # drop the oldest entries first
+                embeddings = embeddings[-self.max_entries:]
+                del values[:-self.max_entries]
+            self._embeddings[namespace] = embeddings
+
+    def get(self, prompt_text: str, namespace: str = "") -> Optional[str]:
+        return self._lookup(self._embed(prompt_text), namespace)
+
+    def set(self, prompt_text: str, value: str, namespace: str = ""):
+        self._store(self._embed(prompt_text), value, namespace)
+
+    def get_or_compute(self, prompt_text: str, compute: Callable[[], str], namespace: str = "") -> str:
+        """
+        Return a cached value for a similar prompt, or compute, store and return a new one.
+        If the prompt can't be embedded, the cache is skipped and `compute` runs uncached.
+        """
+        try:
+            embedding = self._embed(prompt_text)
+        except Exception as e:
+            print(f"Semantic cache unavailable, calling through: {e}")
+            return compute()
+        cached = self._lookup(embedding, namespace)
+        if cached is not None:
+            return cached
+        value = compute()
+        self._store(embedding, value, namespace)
+        return value
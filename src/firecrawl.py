@@ -1,38 +1,100 @@
 import os
-from firecrawl import FirecrawlApp, ScrapeOptions
+import asyncio
+from typing import List, Optional
+import httpx
+from firecrawl.firecrawl import SearchResponse, ScrapeResponse
 from dotenv import load_dotenv
+from .cache import cached
 
 load_dotenv()
 
+# repeat queries across reruns are served from disk; FIRECRAWL_CACHE=off forces a refresh
+FIRECRAWL_CACHE_TTL = 24 * 60 * 60
+FIRECRAWL_CACHE_DIR = "./.firecrawl_cache"
 
-class FirecrawlService:
-    def __init__(self):
+
+class AsyncFirecrawlService:
+    """Firecrawl client on a shared httpx.AsyncClient.
+
+    The connection pool is opened lazily and bound to the running event loop,
+    so use the service as an async context manager around a single run.
+    """
+
+    def __init__(self, max_connections: int = 20):
         api_key = os.getenv("FIRECRAWL_API_KEY")
         if not api_key:
             raise ValueError("Missing FIRECRAWL_API_KEY environment variable")
-        self.app = FirecrawlApp(api_key=api_key)
+        self.api_key = api_key
+        self.api_url = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev")
+        self.limits = httpx.Limits(max_connections=max_connections)
+        self._client: Optional[httpx.AsyncClient] = None
 
-    def search_companies(self, query: str, num_results: int = 5):
-        try:
-            result = self.app.search(
-                query=f"{query} company pricing",
-                limit=num_results,
-                scrape_options=ScrapeOptions(
-                    formats=["markdown"]
-                )
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=self.limits,
+                timeout=httpx.Timeout(120.0),
             )
-            return result
+        return self._client
+
+    async def _post(self, endpoint: str, payload: dict) -> dict:
+        response = await self._get_client().post(endpoint, json=payload)
+        response.raise_for_status()
+        response_json = response.json()
+        if not response_json.get("success") or "data" not in response_json:
+            raise Exception(f"Firecrawl {endpoint} failed. Error: {response_json.get('error', response_json)}")
+        return response_json
+
+    # raw JSON dicts are cached rather than SDK models, so entries survive SDK upgrades
+    @cached(ttl=FIRECRAWL_CACHE_TTL, directory=FIRECRAWL_CACHE_DIR, toggle_env="FIRECRAWL_CACHE")
+    async def _search(self, query: str, num_results: int) -> dict:
+        return await self._post("/v1/search", {
+            "query": f"{query} company pricing",
+            "limit": num_results,
+            "scrapeOptions": {"formats": ["markdown"]},
+        })
+
+    @cached(ttl=FIRECRAWL_CACHE_TTL, directory=FIRECRAWL_CACHE_DIR, toggle_env="FIRECRAWL_CACHE")
+    async def _scrape(self, url: str) -> dict:
+        return await self._post("/v1/scrape", {
+            "url": url,
+            "formats": ["markdown"],
+        })
+
+    async def search_companies(self, query: str, num_results: int = 5):
+        try:
+            return SearchResponse(**await self._search(query, num_results))
         except Exception as e:
             print(e)
             return []
 
-    def scrape_company_pages(self, url: str):
+    async def batch_search(self, queries: List[str], num_results: int = 1) -> list:
+        """
+        Run several searches at once; results line up with `queries`.
+        Firecrawl has no multi-query search endpoint, so distinct queries are issued concurrently.
+        """
+        unique = list(dict.fromkeys(queries))
+        results = await asyncio.gather(*[self.search_companies(query, num_results) for query in unique])
+        by_query = dict(zip(unique, results))
+        return [by_query[query] for query in queries]
+
+    async def scrape_company_pages(self, url: str):
         try:
-            result = self.app.scrape_url(
-                url,
-                formats=["markdown"]
-            )
-            return result
+            response_json = await self._scrape(url)
+            return ScrapeResponse(**response_json["data"])
         except Exception as e:
             print(e)
             return None
@@ -1,4 +1,5 @@
-from typing import List, Optional, Dict, Any
+import operator
+from typing import Annotated, List, Optional, Dict, Any
 from pydantic import BaseModel
 
 
@@ -13,6 +14,16 @@ class CompanyAnalysis(BaseModel):
     integration_capabilities: List[str] = []
 
 
+class NamedCompanyAnalysis(CompanyAnalysis):
+    """One item of a batch analysis; the name ties it back to its tool"""
+    name: str
+
+
+class BatchCompanyAnalysis(BaseModel):
+    """Structured output for analyzing several companies in one LLM call"""
+    analyses: List[NamedCompanyAnalysis]
+
+
 class CompanyInfo(BaseModel):
     name: str
     description: str
@@ -28,9 +39,28 @@ class CompanyInfo(BaseModel):
     developer_experience_rating: Optional[str] = None  # Poor, Good, Excellent
 
 
+class ToolResearchState(BaseModel):
+    """Input of a single fanned-out research_one node"""
+    tool: str
+    search_result: Optional[Dict[str, Any]] = None  # Top "official site" hit, if any
+    guess_url: Optional[str] = None  # Speculatively scraped <tool>.com, raced against the search hit
+
+
+class ToolResearch(BaseModel):
+    """Output of a research_one node: the company and its trimmed page content, if scraped"""
+    company: CompanyInfo
+    content: Optional[str] = None
+
+
 class ResearchState(BaseModel):
     query: str
     extracted_tools: List[str] = []  # Tools extracted from articles
     companies: List[CompanyInfo] = []
     search_results: List[Dict[str, Any]] = []
-    analysis: Optional[str] = None
\ No newline at end of file
+    analysis: Optional[str] = None
+
+
+class ResearchGraphState(ResearchState):
+    """Graph state: ResearchState plus fan-out bookkeeping that isn't part of the result"""
+    research_tools: List[ToolResearchState] = []  # Discovered tools to fan out research over
+    research: Annotated[List[ToolResearch], operator.add] = []  # Concatenated research_one results
\ No newline at end of file
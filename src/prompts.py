@@ -1,4 +1,7 @@
 
+from typing import List, Tuple
+
+
 class DeveloperToolsPrompts:
     """Collection of prompts for analyzing developer tools and technologies"""
 
@@ -35,7 +38,7 @@ class DeveloperToolsPrompts:
     @staticmethod
     def tool_analysis_user(company_name: str, content: str) -> str:
         return f"""Company/Tool: {company_name}
-                Website Content: {content[:2500]}
+                Website Content: {content}
 
                 Analyze this content from a developer's perspective and provide:
                 - pricing_model: One of "Free", "Freemium", "Paid", "Enterprise", or "Unknown"
@@ -48,6 +51,33 @@ class DeveloperToolsPrompts:
 
                 Focus on developer-relevant features like APIs, SDKs, language support, integrations, and development workflows."""
 
+    # Batched variant: one call analyzes every researched tool
+    TOOL_ANALYSIS_BATCH_SYSTEM = """You are analyzing several developer tools and programming technologies at once. 
+                            Focus on extracting information relevant to programmers and software developers. 
+                            Pay special attention to programming languages, frameworks, APIs, SDKs, and development workflows. 
+                            Analyze each tool independently, using only the content provided for that tool."""
+
+    @staticmethod
+    def tool_analysis_batch_user(tools: List[Tuple[str, str]]) -> str:
+        sections = "\n\n".join(
+            f"""Tool {i}: {company_name}
+                Website Content: {content}"""
+            for i, (company_name, content) in enumerate(tools, start=1)
+        )
+        return f"""{sections}
+
+                Analyze each of the {len(tools)} tools above from a developer's perspective and return exactly {len(tools)} analyses, in the same order as the tools, each with:
+                - name: The tool's name exactly as given after "Tool N:"
+                - pricing_model: One of "Free", "Freemium", "Paid", "Enterprise", or "Unknown"
+                - is_open_source: true if open source, false if proprietary, null if unclear
+                - tech_stack: List of programming languages, frameworks, databases, APIs, or technologies supported/used
+                - description: Brief 1-sentence description focusing on what this tool does for developers
+                - api_available: true if REST API, GraphQL, SDK, or programmatic access is mentioned
+                - language_support: List of programming languages explicitly supported (e.g., Python, JavaScript, Go, etc.)
+                - integration_capabilities: List of tools/platforms it integrates with (e.g., GitHub, VS Code, Docker, AWS, etc.)
+
+                Focus on developer-relevant features like APIs, SDKs, language support, integrations, and development workflows."""
+
     # Recommendation prompts
     RECOMMENDATIONS_SYSTEM = """You are a senior software engineer providing quick, concise tech recommendations. 
                             Keep responses brief and actionable - maximum 3-4 sentences total."""
@@ -0,0 +1,3 @@
+from .text import clean_and_trim, load_encoding
+
+__all__ = ["clean_and_trim", "load_encoding"]
@@ -0,0 +1,62 @@
+import re
+import threading
+import time
+
+# Claude's tokenizer isn't available offline; cl100k_base is a close proxy for budgeting
+_ENCODING_NAME = "cl100k_base"
+# used until the encoding is loaded (it is downloaded on first use)
+_CHARS_PER_TOKEN = 4
+# a failed download is retried after this many seconds
+_RETRY_AFTER = 10 * 60
+
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_HTML_TAG = re.compile(r"<[^>]+>")
+# a line made only of links (and list/separator punctuation) is navigation, not content
+_LINK_ONLY_LINE = re.compile(r"^[\s\-*+|•·>#]*(?:\[[^\]]*\]\([^)]*\)[\s\-*+|•·,]*)+$")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+_encoding = None
+_next_attempt = 0.0
+_load_lock = threading.Lock()
+
+
+def load_encoding():
+    """
+    Load the tokenizer, downloading it on first use. This blocks, so call it before a run
+    rather than from the event loop; clean_and_trim never loads it itself.
+    """
+    global _encoding, _next_attempt
+    with _load_lock:
+        if _encoding is None and time.monotonic() >= _next_attempt:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(_ENCODING_NAME)
+            except Exception as e:
+                _next_attempt = time.monotonic() + _RETRY_AFTER
+                print(f"Tokenizer unavailable, estimating tokens from length: {e}")
+    return _encoding
+
+
+def strip_boilerplate(md: str) -> str:
+    """Drop images, nav link rows and inline HTML from scraped markdown, keeping link text."""
+    lines = [line for line in _IMAGE.sub("", md).splitlines() if not _LINK_ONLY_LINE.match(line)]
+    text = _HTML_TAG.sub("", _LINK.sub(r"\1", "\n".join(lines)))
+    text = "\n".join(" ".join(line.split()) for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def clean_and_trim(md: str, max_tokens: int) -> str:
+    """
+    Strip page boilerplate, then cut to at most `max_tokens` tokens on a token boundary.
+    Until load_encoding() has succeeded, tokens are estimated from length.
+    """
+    text = strip_boilerplate(md or "")
+    encoding = _encoding
+    if encoding is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
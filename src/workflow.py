@@ -1,15 +1,58 @@
 # src/workflow.py
-from typing import Dict, Any, Callable, Optional, List
+import asyncio
+import hashlib
+import re
+import threading
+import orjson
+from urllib.parse import urlparse
+from typing import Dict, Any, Callable, Optional, List, Tuple, Type
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
-from .models import ResearchState, CompanyInfo, CompanyAnalysis
-from .firecrawl import FirecrawlService
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel
+from .models import (
+    ResearchState, ResearchGraphState, CompanyInfo, CompanyAnalysis, BatchCompanyAnalysis, ToolResearch,
+    ToolResearchState
+)
+from .firecrawl import AsyncFirecrawlService
 from .prompts import DeveloperToolsPrompts
+from .cache import FuzzyContentCache, LLMCache, SemanticCache
+from .utils import clean_and_trim, load_encoding
+
+
+# shared by every Workflow in the process so hits carry across Streamlit reruns
+_SEMANTIC_CACHE = SemanticCache()
+# one instance per process, so its lock covers every session using the on-disk index
+_ANALYSIS_CACHE = FuzzyContentCache()
 
 
 ProgressCallback = Optional[Callable[[Dict[str, Any]], None]]
 
+# token budgets for scraped page content sent to the LLM
+EXTRACTION_MAX_TOKENS = 400  # per article
+ANALYSIS_MAX_TOKENS = 600  # per tool
+# a speculatively scraped <tool>.com page shorter than this is treated as a miss
+GUESS_MIN_MARKDOWN = 500
+
+
+def _guess_tool_url(tool_name: str) -> Optional[str]:
+    """<name>.com for single-word names like "Vercel"; None for anything that doesn't look like a domain label."""
+    name = tool_name.strip()
+    if not re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9-]*", name):
+        return None
+    return f"https://{name.lower()}.com"
+
+
+def _host(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def cached_system_message(text: str) -> SystemMessage:
+    """System prompt marked as an Anthropic prompt-cache breakpoint (5-minute ephemeral cache)."""
+    return SystemMessage(content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}])
+
 
 class Workflow:
     def __init__(self, progress_callback: ProgressCallback = None):
@@ -20,14 +63,22 @@ class Workflow:
           - {'phase': 'research_tool_start', 'tool': '...'}
           - {'phase': 'company_ready', 'company': {...}}  (company as dict)
           - {'phase': 'analysis_start'}
+          - {'phase': 'analysis_delta', 'delta': '...'}  (streamed chunk, not sent on cache hits)
           - {'phase': 'analysis_done', 'analysis': '...'}
-          - {'phase': 'final', 'final_state': {...}}
           - {'phase': 'error', 'error': '...'}
         """
-        self.firecrawl = FirecrawlService()
+        self.firecrawl = AsyncFirecrawlService()
         self.llm = ChatAnthropic(model="claude-3-haiku-20240307", temperature=0.1)
         self.prompts = DeveloperToolsPrompts()
+        self.semantic_cache = _SEMANTIC_CACHE
+        self.llm_cache = LLMCache()
+        self.analysis_cache = _ANALYSIS_CACHE
         self._progress_callback = progress_callback
+        self._emit_lock = threading.Lock()
+        # url -> in-flight or finished scrape, shared by every step of the current run
+        self._scrape_tasks: Dict[str, asyncio.Task] = {}
+        # guessed <tool>.com url -> speculative scrape started by plan_research
+        self._guess_tasks: Dict[str, asyncio.Task] = {}
         self.workflow = self._build_workflow()
 
     def set_progress_callback(self, cb: ProgressCallback):
@@ -35,46 +86,152 @@ class Workflow:
 
     def _emit(self, event: Dict[str, Any]):
         try:
-            if callable(self._progress_callback):
-                self._progress_callback(event)
+            # callbacks touch Streamlit widgets, which are not safe to update concurrently
+            with self._emit_lock:
+                if callable(self._progress_callback):
+                    self._progress_callback(event)
         except Exception as e:
             # don't interrupt the run if callback errors
             print("Progress callback error:", e)
 
     def _build_workflow(self):
-        graph = StateGraph(ResearchState)
-        graph.add_node("extract_tools", self._extract_tools_step)
-        graph.add_node("research", self._research_step)
-        graph.add_node("analyze", self._analyze_step)
+        graph = StateGraph(ResearchGraphState)
+        graph.add_node("extract_tools", self._extract_tools_step_async)
+        graph.add_node("plan_research", self._plan_research_step_async)
+        graph.add_node("research_one", self._research_one_step_async, input_schema=ToolResearchState)
+        graph.add_node("join", self._join_research_step_async)
+        graph.add_node("analyze", self._analyze_step_async)
         graph.set_entry_point("extract_tools")
-        graph.add_edge("extract_tools", "research")
-        graph.add_edge("research", "analyze")
+        graph.add_edge("extract_tools", "plan_research")
+        # map step: one research_one per tool, run concurrently; join waits for all of them
+        graph.add_conditional_edges("plan_research", self._fan_out_research, ["research_one", "join"])
+        graph.add_edge("research_one", "join")
+        graph.add_edge("join", "analyze")
         graph.add_edge("analyze", END)
         return graph.compile()
 
-    def _extract_tools_step(self, state: ResearchState) -> Dict[str, Any]:
+    def cached_invoke(
+        self,
+        messages: List[BaseMessage],
+        schema: Optional[Type[BaseModel]] = None,
+        semantic: bool = False,
+        on_delta: Optional[Callable[[str], None]] = None,
+        semantic_text: Optional[str] = None,
+        validate: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Invoke the LLM through the exact-match cache, then optionally the semantic one.
+        Returns the response text, or the JSON of a `schema` instance for structured output.
+        With `on_delta`, plain-text misses are streamed and each chunk is passed to it.
+        `semantic_text` replaces the user prompt as the text embedded for the semantic lookup.
+        `validate` is called on each fresh response before it is cached; raising keeps it out.
+        """
+        model = getattr(self.llm, "model", None)
+        temperature = getattr(self.llm, "temperature", None)
+        key = self.llm_cache.cache_key(model, messages, temperature, schema)
+
+        def call_llm() -> str:
+            if schema is not None:
+                return self.llm.with_structured_output(schema).invoke(messages).model_dump_json()
+            if on_delta is None:
+                return self.llm.invoke(messages).content
+            buf = ""
+            for chunk in self.llm.stream(messages):
+                delta = chunk.text()
+                if delta:
+                    buf += delta
+                    on_delta(delta)
+            return buf
+
+        def compute() -> str:
+            value = call_llm()
+            if validate is not None:
+                validate(value)
+            # only the model's own answer to this prompt becomes its exact-match entry
+            self.llm_cache.set(key, value)
+            return value
+
+        cached = self.llm_cache.get(key)
+        if cached is not None:
+            return cached
+        if not semantic:
+            return compute()
+        # answers from another model or sampling temperature are never a match
+        namespace = f"{model}|{temperature}|{messages[0].text()}"
+        prompt_text = semantic_text if semantic_text is not None else messages[-1].text()
+        return self.semantic_cache.get_or_compute(prompt_text, compute, namespace=namespace)
+
+    async def _ainvoke(
+        self,
+        messages: List[BaseMessage],
+        schema: Optional[Type[BaseModel]] = None,
+        semantic: bool = False,
+        stream_phase: Optional[str] = None,
+        semantic_text: Optional[str] = None,
+        validate: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        # The sync Anthropic client is run off-loop: its async httpx pool is cached
+        # process-wide and would otherwise be reused across asyncio.run() loops.
+        # Cache lookups (disk, embeddings) block too, so they ride along.
+        if not stream_phase:
+            return await asyncio.to_thread(
+                self.cached_invoke, messages, schema, semantic, None, semantic_text, validate
+            )
+
+        # deltas are emitted from this coroutine rather than from loop callbacks, so control-flow
+        # exceptions raised by the progress callback (Streamlit's stop/rerun) propagate as usual
+        loop = asyncio.get_running_loop()
+        deltas: asyncio.Queue = asyncio.Queue()
+        abandoned = threading.Event()
+
+        def on_delta(delta: str):
+            if abandoned.is_set():
+                # ends the LLM stream in the worker thread
+                raise RuntimeError("stream abandoned by caller")
+            loop.call_soon_threadsafe(deltas.put_nowait, delta)
+
+        worker = asyncio.ensure_future(asyncio.to_thread(
+            self.cached_invoke, messages, schema, semantic, on_delta, semantic_text, validate
+        ))
+        # queued after every delta the worker scheduled, so it marks the end of the stream
+        worker.add_done_callback(lambda _: deltas.put_nowait(None))
+        try:
+            while (delta := await deltas.get()) is not None:
+                self._emit({"phase": stream_phase, "delta": delta})
+        except BaseException:
+            # stop the worker at its next chunk; nobody is left to see its error
+            abandoned.set()
+            worker.add_done_callback(lambda task: task.cancelled() or task.exception())
+            raise
+        return await worker
+
+    async def _extract_tools_step_async(self, state: ResearchGraphState) -> Dict[str, Any]:
         try:
             self._emit({"phase": "extract_tools_start", "query": state.query})
             article_query = f"{state.query} tools comparison best alternatives"
-            search_results = self.firecrawl.search_companies(article_query, num_results=3)
+            search_results = await self.firecrawl.search_companies(article_query, num_results=3)
 
-            all_content = ""
+            chunks: List[str] = []
             if search_results and getattr(search_results, "data", None):
+                # search already scrapes each hit as markdown; only fetch the pages it came back without
+                missing = [result.get("url", "") for result in search_results.data if not result.get("markdown")]
+                scrapes = await asyncio.gather(*[self._scrape_once_async(url) for url in missing])
+                scraped_by_url = dict(zip(missing, scrapes))
                 for result in search_results.data:
-                    url = result.get("url", "")
-                    scraped = self.firecrawl.scrape_company_pages(url)
-                    if scraped and getattr(scraped, "markdown", None):
-                        all_content += scraped.markdown[:1500] + "\n\n"
+                    markdown = result.get("markdown") or getattr(scraped_by_url.get(result.get("url", "")), "markdown", None)
+                    if markdown:
+                        chunks.append(clean_and_trim(markdown, EXTRACTION_MAX_TOKENS))
+            all_content = "\n\n".join(chunks)
 
             messages = [
-                SystemMessage(content=self.prompts.TOOL_EXTRACTION_SYSTEM),
+                cached_system_message(self.prompts.TOOL_EXTRACTION_SYSTEM),
                 HumanMessage(content=self.prompts.tool_extraction_user(state.query, all_content))
             ]
 
-            response = self.llm.invoke(messages)
+            response = await self._ainvoke(messages)
             tool_names = [
                 name.strip()
-                for name in response.content.strip().split("\n")
+                for name in response.strip().split("\n")
                 if name.strip()
             ]
             self._emit({"phase": "extracted_tools", "tools": tool_names})
@@ -84,17 +241,15 @@ class Workflow:
             print(e)
             return {"extracted_tools": []}
 
-    def _analyze_company_content(self, company_name: str, content: str) -> CompanyAnalysis:
+    async def _analyze_company_content_async(self, company_name: str, content: str) -> CompanyAnalysis:
         try:
-            structured_llm = self.llm.with_structured_output(CompanyAnalysis)
-
             messages = [
-                SystemMessage(content=self.prompts.TOOL_ANALYSIS_SYSTEM),
+                cached_system_message(self.prompts.TOOL_ANALYSIS_SYSTEM),
                 HumanMessage(content=self.prompts.tool_analysis_user(company_name, content))
             ]
 
-            analysis = structured_llm.invoke(messages)
-            return analysis
+            analysis = await self._ainvoke(messages, schema=CompanyAnalysis, semantic=True)
+            return CompanyAnalysis.model_validate_json(analysis)
         except Exception as e:
             print(e)
             return CompanyAnalysis(
@@ -107,13 +262,103 @@ class Workflow:
                 integration_capabilities=[],
             )
 
-    def _research_step(self, state: ResearchState) -> Dict[str, Any]:
+    def _analysis_cache_namespace(self) -> Optional[str]:
+        """
+        Fuzzy-cache namespace for tool analyses under the current model, temperature and prompts,
+        or None when sampling is too random to reuse results (the same rule as the LLM cache).
+        """
+        model = getattr(self.llm, "model", None)
+        temperature = getattr(self.llm, "temperature", None)
+        if temperature is not None and temperature > self.llm_cache.max_temperature:
+            return None
+        prompts = "\n".join([
+            self.prompts.TOOL_ANALYSIS_SYSTEM,
+            self.prompts.tool_analysis_user("", ""),
+            self.prompts.TOOL_ANALYSIS_BATCH_SYSTEM,
+            self.prompts.tool_analysis_batch_user([("", "")]),
+        ])
+        prompt_hash = hashlib.sha256(prompts.encode()).hexdigest()[:16]
+        return f"{model}|{temperature}|{prompt_hash}"
+
+    async def _analyze_companies_async(self, tools: List[Tuple[str, str]]) -> List[CompanyAnalysis]:
+        """Analyze (name, content) pairs, reusing analyses of near-identical pages seen before."""
+        namespace = self._analysis_cache_namespace()
+        if namespace is None:
+            return await self._analyze_batch_async(tools)
+
+        def cached_analysis(company_name: str, content: str) -> Optional[CompanyAnalysis]:
+            hit = self.analysis_cache.get(f"{namespace}|{company_name}", content)
+            if hit is None:
+                return None
+            try:
+                return CompanyAnalysis.model_validate_json(hit)
+            except ValueError as e:
+                # an unreadable entry is a miss, not a failed research step
+                print(f"Ignoring invalid cached analysis for {company_name}: {e}")
+                return None
+
+        hits = await asyncio.to_thread(
+            lambda: [cached_analysis(company_name, content) for company_name, content in tools]
+        )
+        misses = [tool for tool, hit in zip(tools, hits) if hit is None]
+        fresh = iter(await self._analyze_batch_async(misses))
+
+        analyses: List[CompanyAnalysis] = []
+        to_store: List[Tuple[str, str, str]] = []
+        for (company_name, content), hit in zip(tools, hits):
+            if hit is not None:
+                analyses.append(hit)
+                continue
+            analysis = next(fresh)
+            analyses.append(analysis)
+            # don't persist the placeholder returned when an analysis call fails
+            if analysis.description != "Failed":
+                to_store.append((f"{namespace}|{company_name}", content, analysis.model_dump_json()))
+
+        if to_store:
+            await asyncio.to_thread(
+                lambda: [self.analysis_cache.set(*entry) for entry in to_store]
+            )
+        return analyses
+
+    async def _analyze_batch_async(self, tools: List[Tuple[str, str]]) -> List[CompanyAnalysis]:
+        """Analyze (name, content) pairs in a single LLM call, falling back to one call per tool."""
+        if not tools:
+            return []
+        try:
+            messages = [
+                cached_system_message(self.prompts.TOOL_ANALYSIS_BATCH_SYSTEM),
+                HumanMessage(content=self.prompts.tool_analysis_batch_user(tools))
+            ]
+
+            def match_by_name(batch: str) -> List[CompanyAnalysis]:
+                # answers are matched on name, not position, so a reordered batch can't swap tools
+                analyses = BatchCompanyAnalysis.model_validate_json(batch).analyses
+                by_name = {analysis.name.strip().lower(): analysis for analysis in analyses}
+                names = [company_name.strip().lower() for company_name, _ in tools]
+                if len(analyses) != len(tools) or any(name not in by_name for name in names):
+                    returned = [analysis.name for analysis in analyses]
+                    raise ValueError(f"Batch analysis returned {returned} for {[name for name, _ in tools]}")
+                return [CompanyAnalysis(**by_name[name].model_dump(exclude={"name"})) for name in names]
+
+            # raised before caching, so a mismatched response isn't replayed on later runs
+            batch = await self._ainvoke(messages, schema=BatchCompanyAnalysis, validate=match_by_name)
+            return match_by_name(batch)
+        except Exception as e:
+            print(e)
+
+        return list(await asyncio.gather(*[
+            self._analyze_company_content_async(company_name, content)
+            for company_name, content in tools
+        ]))
+
+    async def _plan_research_step_async(self, state: ResearchGraphState) -> Dict[str, Any]:
         try:
             extracted_tools = getattr(state, "extracted_tools", []) or []
 
             if not extracted_tools:
                 self._emit({"phase": "research_fallback", "query": state.query})
-                search_results = self.firecrawl.search_companies(state.query, num_results=4)
+                search_results = await self.firecrawl.search_companies(state.query, num_results=4)
                 tool_names = [
                     result.get("metadata", {}).get("title", "Unknown")
                     for result in (getattr(search_results, "data", []) or [])
@@ -123,46 +368,132 @@ class Workflow:
 
             self._emit({"phase": "research_start", "tools": tool_names})
 
-            companies: List[CompanyInfo] = []
-            for tool_name in tool_names:
-                self._emit({"phase": "research_tool_start", "tool": tool_name})
-                tool_search_results = self.firecrawl.search_companies(tool_name + " official site", num_results=1)
-
-                if not tool_search_results or not getattr(tool_search_results, "data", None):
+            # speculatively scrape a guessed <tool>.com while discovery runs; the guesses are left
+            # running and each research_one branch races its own against the search hit
+            guess_urls = [_guess_tool_url(tool_name) for tool_name in tool_names]
+            self._guess_tasks = {
+                url: asyncio.ensure_future(self._scrape_guess_async(url)) for url in guess_urls if url
+            }
+            # discover every tool's site up front so research_one branches only scrape
+            search_results = await self.firecrawl.batch_search(
+                [tool_name + " official site" for tool_name in tool_names], num_results=1
+            )
+            research_tools = []
+            for tool_name, tool_search_results, guess_url in zip(tool_names, search_results, guess_urls):
+                search_result = None
+                if tool_search_results and getattr(tool_search_results, "data", None):
+                    search_result = tool_search_results.data[0]
+                if search_result is None and guess_url is None:
                     # skip if no results
                     continue
+                research_tools.append(ToolResearchState(
+                    tool=tool_name, search_result=search_result, guess_url=guess_url
+                ))
+            return {"research_tools": research_tools}
+        except Exception as e:
+            self._emit({"phase": "error", "error": f"research failed: {e}"})
+            print(e)
+            return {"research_tools": []}
 
-                result = tool_search_results.data[0]
-                url = result.get("url", "")
-
-                company = CompanyInfo(
-                    name=tool_name,
-                    description=result.get("markdown", ""),
-                    website=url,
-                    tech_stack=[],
-                    competitors=[]
-                )
-
-                scraped = self.firecrawl.scrape_company_pages(url)
-                if scraped and getattr(scraped, "markdown", None):
-                    content = scraped.markdown
-                    analysis = self._analyze_company_content(company.name, content)
-
-                    company.pricing_model = analysis.pricing_model
-                    company.is_open_source = analysis.is_open_source
-                    company.tech_stack = analysis.tech_stack
-                    company.description = analysis.description
-                    company.api_available = analysis.api_available
-                    company.language_support = analysis.language_support
-                    company.integration_capabilities = analysis.integration_capabilities
-
-                companies.append(company)
-                # emit the company as soon as it's ready
-                try:
-                    self._emit({"phase": "company_ready", "company": company.dict()})
-                except Exception:
-                    # fallback if company.dict() fails
-                    self._emit({"phase": "company_ready", "company": vars(company)})
+    async def _scrape_guess_async(self, url: Optional[str]) -> Optional[str]:
+        """Markdown of a guessed tool URL, or None unless it looks like a real page."""
+        if not url:
+            return None
+        scraped = await self._scrape_once_async(url)
+        markdown = getattr(scraped, "markdown", None) if scraped else None
+        if markdown and len(markdown) > GUESS_MIN_MARKDOWN:
+            return markdown
+        return None
+
+    async def _race_tool_page_async(self, search_url: str, guess_url: Optional[str]) -> Tuple[str, Optional[str]]:
+        """
+        (url, markdown) of whichever of the search hit and the guessed <tool>.com gives a usable
+        page first. The guess only counts when there is no hit or it is on the hit's host.
+        Falls back to (search_url, None), or ("", None) when there is no search hit either.
+        """
+        guess = self._guess_tasks.get(guess_url) if guess_url else None
+        if guess is not None and search_url and _host(search_url) != _host(guess_url):
+            # the search found a different site, so the guessed domain is parked or unrelated
+            guess.cancel()
+            guess = None
+        if guess is not None and guess.done() and guess.result():
+            return guess_url, guess.result()
+        if not search_url:
+            page = await guess if guess is not None else None
+            return (guess_url, page) if page else ("", None)
+
+        async def scrape_search_hit() -> Optional[str]:
+            scraped = await self._scrape_once_async(search_url)
+            return getattr(scraped, "markdown", None) if scraped else None
+
+        scrape = asyncio.ensure_future(scrape_search_hit())
+        pending = {scrape} if guess is None else {scrape, guess}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if guess in done and guess.result():
+                return guess_url, guess.result()
+            if scrape in done and scrape.result():
+                return search_url, scrape.result()
+        return search_url, None
+
+    async def _scrape_once_async(self, url: str):
+        """Scrape a URL at most once per run; concurrent callers share the same request."""
+        key = url.rstrip("/")
+        task = self._scrape_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.firecrawl.scrape_company_pages(url))
+            self._scrape_tasks[key] = task
+        # shield so one cancelled caller doesn't cancel the scrape for the others
+        return await asyncio.shield(task)
+
+    def _fan_out_research(self, state: ResearchGraphState) -> List[Any]:
+        return [Send("research_one", tool) for tool in state.research_tools] or ["join"]
+
+    async def _research_one_step_async(self, state: ToolResearchState) -> Dict[str, Any]:
+        """Scrape a single discovered tool, or take its guessed page; analysis is batched in the join step."""
+        tool_name = state.tool
+        try:
+            self._emit({"phase": "research_tool_start", "tool": tool_name})
+            result = state.search_result or {}
+            url, markdown = await self._race_tool_page_async(result.get("url", ""), state.guess_url)
+            if not url:
+                # no search hit and the guessed <tool>.com wasn't a real page
+                return {"research": []}
+
+            company = CompanyInfo(
+                name=tool_name,
+                description=result.get("markdown", ""),
+                website=url,
+                tech_stack=[],
+                competitors=[]
+            )
+
+            content = clean_and_trim(markdown, ANALYSIS_MAX_TOKENS) if markdown else None
+            return {"research": [ToolResearch(company=company, content=content)]}
+        except Exception as e:
+            print(f"research of {tool_name} failed: {e}")
+            return {"research": []}
+
+    async def _join_research_step_async(self, state: ResearchGraphState) -> Dict[str, Any]:
+        try:
+            companies = [item.company for item in state.research]
+            scraped = [item for item in state.research if item.content]
+
+            analyses = await self._analyze_companies_async(
+                [(item.company.name, item.content) for item in scraped]
+            )
+            for item, analysis in zip(scraped, analyses):
+                company = item.company
+                company.pricing_model = analysis.pricing_model
+                company.is_open_source = analysis.is_open_source
+                company.tech_stack = analysis.tech_stack
+                company.description = analysis.description
+                company.api_available = analysis.api_available
+                company.language_support = analysis.language_support
+                company.integration_capabilities = analysis.integration_capabilities
+
+            for company in companies:
+                self._emit({"phase": "company_ready", "company": company.model_dump()})
 
             self._emit({"phase": "research_done", "count": len(companies)})
             return {"companies": companies}
@@ -171,21 +502,26 @@ class Workflow:
             print(e)
             return {"companies": []}
 
-    def _analyze_step(self, state: ResearchState) -> Dict[str, Any]:
+    async def _analyze_step_async(self, state: ResearchGraphState) -> Dict[str, Any]:
         try:
             self._emit({"phase": "analysis_start"})
-            company_data = ", ".join([
-                company.json() for company in state.companies
-            ])
+            company_data = orjson.dumps([
+                company.model_dump(mode="json") for company in state.companies
+            ]).decode()
 
             messages = [
-                SystemMessage(content=self.prompts.RECOMMENDATIONS_SYSTEM),
+                cached_system_message(self.prompts.RECOMMENDATIONS_SYSTEM),
                 HumanMessage(content=self.prompts.recommendations_user(state.query, company_data))
             ]
 
-            response = self.llm.invoke(messages)
-            self._emit({"phase": "analysis_done", "analysis": response.content})
-            return {"analysis": response.content}
+            # the company JSON would fill MiniLM's 256-word-piece window with repeated keys,
+            # so similarity is judged on the query and the tools compared
+            semantic_text = "\n".join([state.query, *[company.name for company in state.companies]])
+            analysis = await self._ainvoke(
+                messages, semantic=True, stream_phase="analysis_delta", semantic_text=semantic_text
+            )
+            self._emit({"phase": "analysis_done", "analysis": analysis})
+            return {"analysis": analysis}
         except Exception as e:
             self._emit({"phase": "error", "error": f"analysis failed: {e}"})
             print(e)
@@ -199,17 +535,34 @@ class Workflow:
             self.set_progress_callback(progress_callback)
 
         try:
-            initial_state = ResearchState(query=query)
-            final_state = self.workflow.invoke(initial_state)
-            # emit final state dict so callers can persist or inspect
-            try:
-                self._emit({"phase": "final", "final_state": final_state})
-            except Exception:
-                pass
-            return ResearchState(**final_state)
+            # the tokenizer may need a download, so load it here rather than on the event loop
+            load_encoding()
+            initial_state = ResearchGraphState(query=query)
+            final_state = asyncio.run(self._arun(initial_state))
+            # fan-out bookkeeping (discovered pages, per-tool research) stays out of the result
+            return ResearchState(**{
+                key: value for key, value in final_state.items() if key in ResearchState.model_fields
+            })
         except Exception as e:
             self._emit({"phase": "error", "error": str(e)})
             raise
         finally:
             # avoid keeping references to external callbacks longer than needed
             self._progress_callback = None
+
+    async def _arun(self, initial_state: ResearchGraphState) -> Dict[str, Any]:
+        # one event loop per run: the Firecrawl connection pool lives and closes with it
+        self._scrape_tasks = {}
+        self._guess_tasks = {}
+        try:
+            async with self.firecrawl:
+                try:
+                    return await self.workflow.ainvoke(initial_state)
+                finally:
+                    # guesses that lost their race may still be in flight; stop them before the pool closes
+                    for task in [*self._guess_tasks.values(), *self._scrape_tasks.values()]:
+                        task.cancel()
+        finally:
+            # tasks belong to this run's loop
+            self._scrape_tasks = {}
+            self._guess_tasks = {}